@@ -16,176 +16,497 @@ Author: Vadim Belov
 """
 
 import os
+import re
+import sys
+import json
+import time
 import asyncio
+import logging
 import argparse
-from datetime import datetime
+from queue import SimpleQueue
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import requests
+from requests.adapters import HTTPAdapter
 from pytapo import Tapo
 from pytapo.media_stream.downloader import Downloader
 
 # ==================== SETTINGS ====================
 DEFAULT_USER = "admin"  # Default user for most Tapo cameras
 DELETE_AFTER_DOWNLOAD = False  # Set True to delete from camera after download
-WINDOW_SIZE = 1000  # Download window size (affects speed)
+WINDOW_SIZE = 2000  # Initial download window size (affects speed)
+MAX_WINDOW_SIZE = 10000  # Upper bound for the auto-tuned window
+CONCURRENCY = 4  # How many recordings to download at the same time
+SPLIT = 1  # Parallel time slices per recording (1 = whole file at once)
+MIN_SLICE_SECONDS = 60  # Don't split recordings into slices shorter than this
 # ===================================================
 
+# All per-recording messages go through a queue-backed logger so the
+# event loop only enqueues; formatting and the stdout write happen on
+# the QueueListener's thread (see setup_logging)
+logger = logging.getLogger(__name__)
 
-def format_filename(timestamp):
-    """Formats timestamp to required format 20250724_161234-123456789.mp4"""
-    dt = datetime.fromtimestamp(timestamp)
-    local_time = dt.strftime("%Y%m%d_%H%M%S")
-    unix_timestamp = int(timestamp)
-    return f"{local_time}-{unix_timestamp}.mp4"
 
+def setup_logging():
+    """Starts a QueueListener so log formatting/writes leave the event loop"""
+    queue = SimpleQueue()
+    logger.addHandler(QueueHandler(queue))
+    logger.setLevel(logging.INFO)
+    listener = QueueListener(queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
 
-def get_date_folder(timestamp):
-    """Creates path to date folder in format YYYY\MM\DD"""
-    dt = datetime.fromtimestamp(timestamp)
-    return os.path.join(dt.strftime("%Y"), dt.strftime("%m"), dt.strftime("%d"))
+
+# Auto-tuning state for the download window: while throughput keeps up,
+# grow the window so the pipe spends less time idle between refills
+_window_state = {"window": None, "ewma": None}
+
+
+def current_window_size():
+    """Returns the current (possibly auto-tuned) download window size"""
+    if _window_state["window"] is None:
+        _window_state["window"] = WINDOW_SIZE
+    return _window_state["window"]
+
+
+def tune_window_size(duration, elapsed):
+    """Adjusts window size based on last recording's throughput (video sec / wall sec)"""
+    if elapsed <= 0 or duration <= 0:
+        return
+    rate = duration / elapsed
+    if _window_state["ewma"] is None:
+        _window_state["ewma"] = rate
+        return
+    # Throughput held up (>90% of the running average) - request more ahead
+    if rate >= 0.9 * _window_state["ewma"]:
+        _window_state["window"] = min(
+            int(current_window_size() * 1.25), MAX_WINDOW_SIZE)
+    _window_state["ewma"] = 0.5 * _window_state["ewma"] + 0.5 * rate
+
+
+# Local UTC offset per 24h bucket, so datetime.fromtimestamp doesn't
+# consult the local timezone database for every single recording
+_utc_offsets = {}
+
+
+def _bucket_offset(day):
+    """Returns the local UTC offset (seconds) if constant over this 24h bucket, else None"""
+    if day not in _utc_offsets:
+        start = day * 86400
+        first = datetime.fromtimestamp(start).astimezone().utcoffset()
+        last = datetime.fromtimestamp(start + 86399).astimezone().utcoffset()
+        _utc_offsets[day] = first.total_seconds() if first == last else None
+    return _utc_offsets[day]
+
+
+def build_paths(timestamp):
+    """Builds (date folder YYYY\\MM\\DD, filename 20250724_161234-123456789.mp4) from one timestamp"""
+    offset = _bucket_offset(int(timestamp) // 86400)
+    if offset is None:
+        # DST transition inside this bucket - take the exact (slow) path
+        dt = datetime.fromtimestamp(timestamp)
+    else:
+        dt = datetime.fromtimestamp(timestamp + offset, tz=timezone.utc)
+    date_folder = os.path.join(*dt.strftime("%Y/%m/%d").split("/"))
+    filename = f"{dt.strftime('%Y%m%d_%H%M%S')}-{int(timestamp)}.mp4"
+    return date_folder, filename
+
+
+# Precompiled key matchers: a bound re.Pattern.match is cheaper per key
+# than a method lookup + startswith call inside the parse loops
+_DATE_KEY = re.compile(r'search_results_').match
+_RECORDING_KEY = re.compile(r'search_video_results_').match
 
 
 def extract_dates(dates_data):
     """Extracts dates from getRecordingsList() response"""
-    dates = []
-    if isinstance(dates_data, list):
-        for item in dates_data:
-            if isinstance(item, dict):
-                for key, value in item.items():
-                    if key.startswith('search_results_') and isinstance(value, dict) and 'date' in value:
-                        dates.append(value['date'])
-    return dates
+    if not isinstance(dates_data, list):
+        return []
+    return [value['date']
+            for item in dates_data if isinstance(item, dict)
+            for key, value in item.items()
+            if _DATE_KEY(key) and isinstance(value, dict) and 'date' in value]
 
 
 def extract_recordings(recordings_data):
     """Extracts recordings from getRecordings() response"""
-    recordings = []
-    if isinstance(recordings_data, list):
-        for item in recordings_data:
-            if isinstance(item, dict):
-                for key, value in item.items():
-                    if key.startswith('search_video_results_') and isinstance(value, dict):
-                        if 'startTime' in value and 'endTime' in value:
-                            recordings.append(value)
-    return recordings
-
-
-async def download_recording(tapo, recording, base_output_dir, time_correction, index, total):
+    if not isinstance(recordings_data, list):
+        return []
+    return [value
+            for item in recordings_data if isinstance(item, dict)
+            for key, value in item.items()
+            if _RECORDING_KEY(key) and isinstance(value, dict)
+            and 'startTime' in value and 'endTime' in value]
+
+
+def scan_existing_files(base_output_dir):
+    """Scans output folder once and maps date folder -> {filename: size}"""
+    existing = {}
+    for root, _dirs, files in os.walk(base_output_dir):
+        if not files:
+            continue
+        date_folder = os.path.relpath(root, base_output_dir)
+        sizes = {}
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    sizes[entry.name] = entry.stat().st_size
+        existing[date_folder] = sizes
+    return existing
+
+
+INDEX_FILENAME = ".downloaded.json"
+
+
+def load_download_index(base_output_dir, existing):
+    """Loads the index of already-downloaded startTimes, seeding from files on disk"""
+    path = os.path.join(base_output_dir, INDEX_FILENAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = set(json.load(f))
+    except (OSError, ValueError):
+        index = set()
+
+    # Filenames carry the unix startTime (...-1721829154.mp4), so the
+    # scanned tree auto-populates the index on the first run
+    for files in existing.values():
+        for name in files:
+            if name.endswith(".mp4"):
+                suffix = name[:-4].rsplit("-", 1)[-1]
+                if suffix.isdigit():
+                    index.add(int(suffix))
+    return index
+
+
+def save_download_index(base_output_dir, index):
+    """Persists the downloaded index atomically (write temp file, then rename)"""
+    path = os.path.join(base_output_dir, INDEX_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(sorted(index), f)
+    os.replace(tmp_path, path)
+
+
+def ensure_keepalive_session(tapo):
+    """Makes sure pytapo reuses one HTTP session with connection pooling.
+
+    Without keep-alive every executeFunction call pays a fresh TCP/TLS
+    handshake (1-2 RTT), which dominates the delete phase. Recent pytapo
+    versions keep a requests.Session internally; mount a pooled adapter
+    on it, or install one if this version doesn't have a session at all.
+    """
+    session = None
+    for attr in ('session', '_session'):
+        candidate = getattr(tapo, attr, None)
+        if isinstance(candidate, requests.Session):
+            session = candidate
+            break
+
+    if session is None:
+        session = requests.Session()
+        tapo._session = session
+
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def drop_page_cache(filepath):
+    """Tells the kernel we won't re-read this file, so hundreds of GB of
+    footage don't evict useful pages from the page cache (Linux only)"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+TIME_CORRECTION_TTL = 3600  # Re-fetch the camera clock offset after this many seconds
+
+# Cached (value, fetched_at) for getTimeCorrection; read-mostly, so the
+# single-threaded event loop needs no lock around it
+_time_correction_cache = {"value": None, "fetched_at": 0.0}
+
+
+async def get_time_correction(tapo, executor, ttl=TIME_CORRECTION_TTL):
+    """Returns the camera's time correction, cached with a TTL"""
+    now = time.monotonic()
+    if (_time_correction_cache["value"] is None
+            or now - _time_correction_cache["fetched_at"] > ttl):
+        _time_correction_cache["value"] = await asyncio.get_running_loop().run_in_executor(
+            executor, tapo.getTimeCorrection
+        )
+        _time_correction_cache["fetched_at"] = now
+    return _time_correction_cache["value"]
+
+
+def invalidate_time_correction():
+    """Forces the next get_time_correction call to ask the camera again"""
+    _time_correction_cache["value"] = None
+
+
+def _is_time_mismatch_error(error):
+    """Checks if a download error points at camera/host clock disagreement"""
+    message = str(error).lower()
+    return ("time correction" in message or "timestamp" in message
+            or "camera time" in message)
+
+
+def split_time_range(start_time, end_time):
+    """Splits a recording's time range into up to SPLIT consecutive slices.
+
+    The camera's media stream has no HTTP byte-range support, but it is
+    addressable by time, so each slice is fetched by its own Downloader
+    as an independent playable file. Slices shorter than MIN_SLICE_SECONDS
+    aren't worth the extra stream setup.
+    """
+    duration = end_time - start_time
+    slice_count = min(SPLIT, max(1, duration // MIN_SLICE_SECONDS))
+    if slice_count <= 1:
+        return [(start_time, end_time)]
+
+    slice_length = duration // slice_count
+    bounds = [start_time + i * slice_length for i in range(slice_count)]
+    bounds.append(end_time)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+async def run_downloader(tapo, start_time, end_time, time_correction, output_dir, filename, index, total):
+    """Runs one pytapo Downloader for a time range, showing inline progress"""
+    downloader = Downloader(
+        tapo,
+        start_time,
+        end_time,
+        time_correction,
+        output_dir + os.sep,
+        fileName=filename,
+        window_size=current_window_size()
+    )
+
+    last_percent = -1
+    async for status in downloader.download():
+        action = status["currentAction"]
+        progress = status.get("progress", 0)
+        total_time = status.get("total", 0)
+
+        if total_time > 0:
+            percent = int((progress / total_time) * 100)
+            # Progress goes through the queue-backed logger like every
+            # other message, so the listener thread is the only stdout
+            # writer and concurrent bars can't clobber each other; the
+            # filename keeps parallel downloads (and slices) apart
+            if percent != last_percent and percent % 10 == 0:
+                bar_length = 20
+                filled = int(bar_length * percent / 100)
+                bar = "█" * filled + "░" * (bar_length - filled)
+                logger.info(
+                    f"[{index:3d}/{total}] {action} {filename}: [{bar}] {percent}%")
+                last_percent = percent
+        else:
+            if action != "Downloading":
+                logger.info(f"           {action}...")
+
+
+async def download_recording(tapo, recording, base_output_dir, executor, index, total, existing, created_dirs, downloaded_index):
     """Downloads a single recording"""
     start_time = recording['startTime']
     end_time = recording['endTime']
     video_type = recording.get('vedio_type', 'unknown')
     duration = end_time - start_time
 
-    # Create date folder
-    date_folder = get_date_folder(start_time)
+    # Create date folder (only once per distinct date)
+    date_folder, filename = build_paths(start_time)
     output_dir = os.path.join(base_output_dir, date_folder)
-    os.makedirs(output_dir, exist_ok=True)
+    if date_folder not in created_dirs:
+        os.makedirs(output_dir, exist_ok=True)
+        created_dirs.add(date_folder)
 
-    filename = format_filename(start_time)
     filepath = os.path.join(output_dir, filename)
 
-    # Check if file already exists
-    if os.path.exists(filepath):
-        file_size = os.path.getsize(filepath)
+    # The camera's media stream is time-addressable, so long recordings
+    # can be fetched as several consecutive slices in parallel
+    slices = split_time_range(start_time, end_time)
+
+    # Known from a previous run - skip without touching the filesystem.
+    # Only trusted for unsliced downloads: the index is seeded from the
+    # -<startTime>.mp4 filenames on disk, and a leftover first slice of a
+    # partially failed split run carries the exact same name as a complete
+    # recording, so sliced recordings must pass the all-slices check below
+    if len(slices) == 1 and int(start_time) in downloaded_index:
         display_path = date_folder.replace(os.sep, "\\")
-        print(f"\n[{index:3d}/{total}] ⏭️  {display_path}\\{filename}")
-        print(
-            f"           📁 File already exists ({file_size} bytes) - skipping")
+        logger.info(f"[{index:3d}/{total}] ⏭️  {display_path}\\{filename}")
+        logger.info(f"           📁 Already downloaded (indexed) - skipping")
         return "skipped"
 
+    # Check if the recording already exists (pre-scanned, no stat call per
+    # file). The first slice's filename equals the whole-recording filename,
+    # so a sliced recording only counts when EVERY slice file is present -
+    # otherwise a partially failed run would be skipped as complete
+    if len(slices) == 1:
+        file_size = existing.get(date_folder, {}).get(filename)
+        if file_size is not None:
+            display_path = date_folder.replace(os.sep, "\\")
+            logger.info(f"[{index:3d}/{total}] ⏭️  {display_path}\\{filename}")
+            logger.info(
+                f"           📁 File already exists ({file_size} bytes) - skipping")
+            return "skipped"
+    else:
+        slice_paths = [build_paths(slice_start) for slice_start, _ in slices]
+        if all(slice_name in existing.get(slice_folder, {})
+               for slice_folder, slice_name in slice_paths):
+            display_path = date_folder.replace(os.sep, "\\")
+            logger.info(f"[{index:3d}/{total}] ⏭️  {display_path}\\{filename}")
+            logger.info(
+                f"           📁 All {len(slices)} slices already exist - skipping")
+            return "skipped"
+
     display_path = date_folder.replace(os.sep, "\\")
-    print(f"\n[{index:3d}/{total}] 📥 {display_path}\\{filename}")
-    print(f"           ⏱️  Duration: {duration}s, Type: {video_type}")
+    logger.info(f"[{index:3d}/{total}] 📥 {display_path}\\{filename}")
+    logger.info(f"           ⏱️  Duration: {duration}s, Type: {video_type}")
 
     try:
-        downloader = Downloader(
-            tapo,
-            start_time,
-            end_time,
-            time_correction,
-            output_dir + os.sep,
-            fileName=filename,
-            window_size=WINDOW_SIZE
-        )
+        time_correction = await get_time_correction(tapo, executor)
+        download_started = time.monotonic()
 
-        last_percent = -1
-        async for status in downloader.download():
-            action = status["currentAction"]
-            progress = status.get("progress", 0)
-            total_time = status.get("total", 0)
-
-            if total_time > 0:
-                percent = int((progress / total_time) * 100)
-                # Show progress only when changed by 5%
-                if percent != last_percent and percent % 5 == 0:
-                    bar_length = 20
-                    filled = int(bar_length * percent / 100)
-                    bar = "█" * filled + "░" * (bar_length - filled)
-                    print(f"           {action}: [{bar}] {percent}%")
-                    last_percent = percent
-            else:
-                if action != "Downloading":
-                    print(f"           {action}...")
-
-        print(f"           ✅ Downloaded successfully")
+        if len(slices) == 1:
+            await run_downloader(tapo, start_time, end_time, time_correction,
+                                 output_dir, filename, index, total)
+            drop_page_cache(filepath)
+        else:
+            slice_jobs = []
+            for slice_start, slice_end in slices:
+                slice_folder, slice_name = build_paths(slice_start)
+                slice_dir = os.path.join(base_output_dir, slice_folder)
+                # Slices finished by a previous partial run don't need refetching
+                if slice_name in existing.get(slice_folder, {}):
+                    continue
+                if slice_folder not in created_dirs:
+                    os.makedirs(slice_dir, exist_ok=True)
+                    created_dirs.add(slice_folder)
+                slice_jobs.append((slice_dir, slice_name, run_downloader(
+                    tapo, slice_start, slice_end, time_correction,
+                    slice_dir, slice_name, index, total)))
+
+            # Let every slice run to completion so a failing one doesn't
+            # leave its siblings orphaned mid-stream, then fail the
+            # recording if any of them failed
+            slice_results = await asyncio.gather(
+                *[job for _, _, job in slice_jobs], return_exceptions=True)
+            for (slice_dir, slice_name, _), result in zip(slice_jobs, slice_results):
+                if not isinstance(result, BaseException):
+                    drop_page_cache(os.path.join(slice_dir, slice_name))
+            for result in slice_results:
+                if isinstance(result, BaseException):
+                    raise result
+
+        tune_window_size(duration, time.monotonic() - download_started)
+        downloaded_index.add(int(start_time))
+        save_download_index(base_output_dir, downloaded_index)
+        logger.info(f"           ✅ Downloaded successfully")
         return True
 
     except Exception as e:
-        print(f"           ❌ Download error: {e}")
+        # A camera reboot mid-run can shift its clock; make sure the next
+        # attempt re-reads the correction instead of reusing a stale one
+        if _is_time_mismatch_error(e):
+            invalidate_time_correction()
+        logger.info(f"           ❌ Download error: {e}")
         return False
 
 
-async def try_delete_recording(tapo, recording):
-    """Attempts to delete recording from camera"""
-    if not DELETE_AFTER_DOWNLOAD:
-        return False
+# Remembers which delete API variant this camera accepts, so we don't
+# re-try the failing one for every single recording
+_delete_method_cache = None
 
-    try:
-        # Try different API variants for deletion
-        delete_attempts = [
-            {
-                "method": "deleteRecording",
-                "params": {
-                    "playback": {
-                        "delete_video": {
-                            "channel": 0,
-                            "start_time": str(recording['startTime']),
-                            "end_time": str(recording['endTime'])
-                        }
+
+def _is_auth_error(error):
+    """Checks if a pytapo error means broken authentication rather than an unsupported call"""
+    message = str(error)
+    return "Invalid authentication" in message or "40401" in message
+
+
+def _build_delete_attempts(recording):
+    """Builds the API variants for deleting a recording from camera"""
+    return [
+        {
+            "method": "deleteRecording",
+            "params": {
+                "playback": {
+                    "delete_video": {
+                        "channel": 0,
+                        "start_time": str(recording['startTime']),
+                        "end_time": str(recording['endTime'])
                     }
                 }
-            },
-            {
-                "method": "do",
-                "params": {
-                    "playback": {
-                        "delete": {
-                            "start_time": recording['startTime'],
-                            "end_time": recording['endTime']
-                        }
+            }
+        },
+        {
+            "method": "do",
+            "params": {
+                "playback": {
+                    "delete": {
+                        "start_time": recording['startTime'],
+                        "end_time": recording['endTime']
                     }
                 }
             }
-        ]
-
-        for attempt in delete_attempts:
-            try:
-                result = await asyncio.get_event_loop().run_in_executor(
-                    None, tapo.executeFunction, attempt["method"], attempt["params"]
-                )
-                print(f"           🗑️ Deleted from camera")
-                return True
-            except Exception:
-                continue
+        }
+    ]
 
-        print(f"           ⚠️ Deletion not supported")
-        return False
 
-    except Exception as e:
-        print(f"           ⚠️ Deletion error: {e}")
-        return False
+# Once the camera rejects every variant twice in a row, deletion is
+# simply not supported - stop issuing RPCs and spamming the log for it
+_delete_unsupported = False
+_delete_consecutive_failures = 0
+
 
+async def try_delete_recording(tapo, recording, executor):
+    """Attempts to delete recording from camera"""
+    global _delete_method_cache, _delete_unsupported, _delete_consecutive_failures
+
+    if not DELETE_AFTER_DOWNLOAD or _delete_unsupported:
+        return False
 
-async def download_all_videos(tapo, output_dir):
+    delete_attempts = _build_delete_attempts(recording)
+
+    # Once a variant is known to work, skip the others entirely
+    if _delete_method_cache is not None:
+        delete_attempts = [a for a in delete_attempts
+                           if a["method"] == _delete_method_cache]
+
+    for attempt in delete_attempts:
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                executor, tapo.executeFunction, attempt["method"], attempt["params"]
+            )
+            _delete_method_cache = attempt["method"]
+            _delete_consecutive_failures = 0
+            logger.info(f"           🗑️ Deleted from camera")
+            return True
+        except Exception as e:
+            # Don't mistake a broken session for "this variant is unsupported"
+            if _is_auth_error(e):
+                logger.info(f"           ⚠️ Deletion error: {e}")
+                return False
+            continue
+
+    _delete_consecutive_failures += 1
+    if _delete_consecutive_failures >= 2:
+        _delete_unsupported = True
+        logger.info(
+            f"           ⚠️ Deletion not supported by this camera - not trying again")
+    else:
+        logger.info(f"           ⚠️ Deletion not supported")
+    return False
+
+
+async def download_all_videos(tapo, output_dir, executor):
     """Main function for downloading all videos"""
     print("📊 Scanning camera SD card...")
 
@@ -194,8 +515,8 @@ async def download_all_videos(tapo, output_dir):
     print(f"📁 Output folder: {output_dir}")
 
     # Get all dates with recordings
-    dates_data = await asyncio.get_event_loop().run_in_executor(
-        None, tapo.getRecordingsList
+    dates_data = await asyncio.get_running_loop().run_in_executor(
+        executor, tapo.getRecordingsList
     )
     dates = extract_dates(dates_data)
     print(f"📅 Found dates with recordings: {len(dates)}")
@@ -204,14 +525,24 @@ async def download_all_videos(tapo, output_dir):
         print("❌ No recordings found on camera")
         return
 
-    # Collect all recordings
+    # Collect all recordings - fetch every date concurrently, each call is
+    # an independent latency-bound RPC (capped so we don't flood the camera)
     all_recordings = []
     total_duration = 0
 
-    for date in dates:
-        recordings_data = await asyncio.get_event_loop().run_in_executor(
-            None, tapo.getRecordings, date
-        )
+    scan_semaphore = asyncio.BoundedSemaphore(8)
+
+    async def fetch_recordings(date):
+        async with scan_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, tapo.getRecordings, date
+            )
+
+    recordings_lists = await asyncio.gather(
+        *[fetch_recordings(date) for date in dates]
+    )
+
+    for date, recordings_data in zip(dates, recordings_lists):
         recordings = extract_recordings(recordings_data)
         all_recordings.extend(recordings)
 
@@ -221,6 +552,11 @@ async def download_all_videos(tapo, output_dir):
         print(
             f"  📅 {date}: {len(recordings):2d} recordings, {date_duration//60:3d}min {date_duration % 60:2d}sec")
 
+    # Download in chronological order so writes stay grouped by date
+    # folder - one directory's dentries/inodes at a time instead of
+    # bouncing across the whole tree
+    all_recordings.sort(key=lambda r: r['startTime'])
+
     total_count = len(all_recordings)
     hours = total_duration // 3600
     minutes = (total_duration % 3600) // 60
@@ -236,51 +572,82 @@ async def download_all_videos(tapo, output_dir):
         print("❌ No recordings to download")
         return
 
-    # Get time correction
-    time_correction = await asyncio.get_event_loop().run_in_executor(
-        None, tapo.getTimeCorrection
-    )
+    # Warm the time-correction cache (per-recording reads are then free)
+    await get_time_correction(tapo, executor)
 
     print(f"\n🚀 STARTING DOWNLOAD...")
     if DELETE_AFTER_DOWNLOAD:
         print("⚠️  WARNING: Recordings will be deleted from camera after download!")
 
-    # Download all recordings
-    successful = 0
-    failed = 0
-    skipped = 0
-    deleted = 0
-    start_time = datetime.now()
-
-    for i, recording in enumerate(all_recordings, 1):
-        result = await download_recording(tapo, recording, output_dir, time_correction, i, total_count)
-
-        if result == "skipped":
-            skipped += 1
-        elif result == True:
-            successful += 1
-            # Try to delete only successfully downloaded files
-            if await try_delete_recording(tapo, recording):
-                deleted += 1
-        else:
-            failed += 1
-
-        # Show intermediate statistics every 10 files
-        if i % 10 == 0 or i == total_count:
-            elapsed = datetime.now() - start_time
-            remaining = total_count - i
-            if i > 0:
-                avg_time = elapsed.total_seconds() / i
-                eta_seconds = remaining * avg_time
-                eta = f"{int(eta_seconds//3600)}h {int((eta_seconds % 3600)//60)}min"
+    # Download all recordings concurrently, limited by a semaphore so we
+    # don't overwhelm the camera with parallel streams
+    stats = {"successful": 0, "failed": 0, "skipped": 0, "deleted": 0, "done": 0}
+    semaphore = asyncio.BoundedSemaphore(CONCURRENCY)
+    existing = scan_existing_files(output_dir)
+    created_dirs = set(existing)
+    downloaded_index = load_download_index(output_dir, existing)
+    delete_tasks = []
+    start_mono = time.monotonic()
+
+    async def guarded_download(recording, index):
+        async with semaphore:
+            result = await download_recording(tapo, recording, output_dir, executor,
+                                              index, total_count, existing, created_dirs,
+                                              downloaded_index)
+
+            if result == "skipped":
+                stats["skipped"] += 1
+            elif result == True:
+                stats["successful"] += 1
+                # Delete only successfully downloaded files; fire-and-forget
+                # so the delete RPC doesn't block the next download
+                delete_tasks.append(asyncio.create_task(
+                    try_delete_recording(tapo, recording, executor)))
             else:
-                eta = "unknown"
+                stats["failed"] += 1
 
-            print(
-                f"\n📈 Progress: ✅{successful} | ⏭️{skipped} | ❌{failed} | Remaining: {remaining} | ETA: {eta}")
+            stats["done"] += 1
+            return result
+
+    async def progress_reporter():
+        # Show intermediate statistics every 10 seconds
+        while stats["done"] < total_count:
+            await asyncio.sleep(10)
+            done = stats["done"]
+            if done == 0:
+                continue
+
+            elapsed = time.monotonic() - start_mono
+            remaining = total_count - done
+            avg_time = elapsed / done
+            eta_seconds = remaining * avg_time
+            eta = f"{int(eta_seconds//3600)}h {int((eta_seconds % 3600)//60)}min"
+
+            logger.info(
+                f"📈 Progress: ✅{stats['successful']} | ⏭️{stats['skipped']} | ❌{stats['failed']} | Remaining: {remaining} | ETA: {eta}")
+
+    reporter = asyncio.create_task(progress_reporter())
+    results = await asyncio.gather(
+        *[guarded_download(r, i) for i, r in enumerate(all_recordings, 1)],
+        return_exceptions=True
+    )
+    reporter.cancel()
+
+    # Tasks that crashed never updated the counters - count them as failures
+    stats["failed"] += sum(1 for r in results if isinstance(r, BaseException))
+
+    # Collect the pipelined delete calls
+    if delete_tasks:
+        delete_results = await asyncio.gather(*delete_tasks, return_exceptions=True)
+        stats["deleted"] = sum(1 for r in delete_results if r is True)
+
+    successful = stats["successful"]
+    failed = stats["failed"]
+    skipped = stats["skipped"]
+    deleted = stats["deleted"]
 
     # Final statistics
-    total_time = datetime.now() - start_time
+    total_time = timedelta(seconds=int(time.monotonic() - start_mono))
     print(f"\n" + "=" * 60)
     print(f"🎉 DOWNLOAD COMPLETED!")
     print(f"  ✅ Successfully downloaded: {successful}")
@@ -321,6 +688,16 @@ Examples:
                         help='Output directory (default: current directory)')
     parser.add_argument('--delete', '-d', action='store_true',
                         help='Delete videos from camera after download (experimental)')
+    parser.add_argument('--concurrency', '-c', type=int, default=CONCURRENCY,
+                        help=f'Number of parallel downloads (default: {CONCURRENCY})')
+    parser.add_argument('--split', '-s', type=int, default=SPLIT,
+                        help='Fetch each long recording as N parallel time slices; '
+                             'each slice becomes its own consecutive .mp4 file '
+                             '(default: 1 = one file per recording)')
+    parser.add_argument('--window-size', '-w', type=int, default=WINDOW_SIZE,
+                        help=f'Initial download window size; larger values amortize '
+                             f'round trips on fast links, smaller ones waste less on '
+                             f'unstable links (default: {WINDOW_SIZE})')
 
     return parser.parse_args()
 
@@ -329,9 +706,12 @@ def main():
     """Main function"""
     args = parse_arguments()
 
-    # Set global delete flag
-    global DELETE_AFTER_DOWNLOAD
+    # Set global flags
+    global DELETE_AFTER_DOWNLOAD, CONCURRENCY, WINDOW_SIZE, SPLIT
     DELETE_AFTER_DOWNLOAD = args.delete
+    CONCURRENCY = args.concurrency
+    WINDOW_SIZE = args.window_size
+    SPLIT = max(1, args.split)
 
     print("🎬 TAPO C200 VIDEO DOWNLOADER")
     print("=" * 50)
@@ -342,15 +722,30 @@ def main():
         f"🗑️ Delete after download: {'YES' if DELETE_AFTER_DOWNLOAD else 'NO'}")
     print("=" * 50)
 
+    # libuv-based event loop is noticeably faster for I/O-heavy asyncio;
+    # purely optional, the selector loop works the same without it
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
+    # One bounded executor for every blocking pytapo call; the default
+    # executor would let concurrent code open too many camera connections
+    executor = ThreadPoolExecutor(max_workers=4)
+    log_listener = setup_logging()
+
     try:
         print("🔌 Connecting to camera...")
         # Create Tapo object OUTSIDE async context
         tapo = Tapo(args.ip, args.user, args.password,
                     args.password, printDebugInformation=False)
+        ensure_keepalive_session(tapo)
         print("✅ Connection successful")
 
         # Run async download
-        asyncio.run(download_all_videos(tapo, args.output))
+        asyncio.run(download_all_videos(tapo, args.output, executor))
 
     except KeyboardInterrupt:
         print("\n⛔ Download interrupted by user")
@@ -360,6 +755,9 @@ def main():
         print("💡 Check IP, login, password settings")
         import traceback
         traceback.print_exc()
+    finally:
+        executor.shutdown(wait=False)
+        log_listener.stop()
 
 
 if __name__ == "__main__":